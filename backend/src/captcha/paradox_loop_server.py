@@ -1,5 +1,6 @@
 import hmac
 from flask import Flask, jsonify, request, abort, has_request_context
+from flask.json.provider import JSONProvider
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 import secrets
@@ -7,19 +8,20 @@ import time
 import hashlib
 import random
 import threading
+import heapq
+import itertools
 import math
-import json
+import operator
 import os
-from typing import Dict, Optional, List, Tuple, Callable, Any
-from collections import deque
+from typing import Annotated, Dict, Optional, List, Tuple, Callable, Any, Union
+import msgspec
+import orjson
 import redis
 import logging
-import base64
-from prometheus_client import generate_latest, REGISTRY, Counter, Gauge, Histogram
-from uuid import uuid4
+from prometheus_client import generate_latest, disable_created_metrics, REGISTRY, Counter, Gauge, Histogram
 from functools import wraps
 from redis.exceptions import RedisError
-from tenacity import retry, stop_after_attempt, wait_exponential
+from werkzeug.exceptions import HTTPException
 import signal
 import sys
 
@@ -38,6 +40,9 @@ TIME_VARIANCE_THRESHOLD_MS = 1000
 RECURSION_DEPTH_WARNING = 5
 BOT_TIMING_TOLERANCE_MS = 1000
 MAX_STORED_ROUNDS = 5
+LOOP_BREAK_INTERVAL_SECONDS = 30
+MAX_MEMORY_SESSIONS = 10000
+MEMORY_SESSION_SHARDS = 32
 METRICS_PREFIX = "paradox_"
 
 # -----------------------
@@ -49,11 +54,23 @@ logger = logging.getLogger(__name__)
 # -----------------------
 # Initialize Flask App
 # -----------------------
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # -----------------------
 # Prometheus Metrics
 # -----------------------
+# No dashboard reads the *_created series; dropping them shrinks every scrape.
+disable_created_metrics()
 sessions_total = Counter(f'{METRICS_PREFIX}sessions_total', 'Total sessions created')
 rounds_total = Counter(f'{METRICS_PREFIX}rounds_total', 'Total rounds processed', ['type', 'trap_mode'])
 session_trap_depth_distribution = Histogram(
@@ -67,6 +84,7 @@ bot_likelihood_score = Histogram(
     buckets=[0.1, 0.3, 0.5, 0.7, 0.9, 1.0]
 )
 challenge_success = Counter(f'{METRICS_PREFIX}challenge_success', 'Challenge success rate', ['type', 'success'])
+deep_trap_sessions = Gauge(f'{METRICS_PREFIX}deep_trap_sessions', 'Sessions past trap depth 3 at the last monitor sweep')
 
 # -----------------------
 # Security Enhancements
@@ -95,7 +113,7 @@ if len(HMAC_SECRET) < 32:
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
 try:
-    redis_pool = redis.ConnectionPool.from_url(REDIS_URL, decode_responses=True)
+    redis_pool = redis.ConnectionPool.from_url(REDIS_URL)
     redis_conn = redis.Redis(connection_pool=redis_pool)
     redis_conn.ping()
     logger.info("Redis connection established")
@@ -114,9 +132,6 @@ def cleanup_resources(signum, frame):
             logger.error(f"Failed to close Redis connection: {e}")
     sys.exit(0)
 
-signal.signal(signal.SIGTERM, cleanup_resources)
-signal.signal(signal.SIGINT, cleanup_resources)
-
 limiter = Limiter(
     app=app,
     key_func=get_remote_address,
@@ -125,18 +140,35 @@ limiter = Limiter(
     headers_enabled=True
 )
 
-_rng_lock = threading.Lock()
-memory_sessions: Dict[str, Dict[str, Any]] = {}
-session_cleanup_lock = threading.Lock()
+# Challenge selection is not security-sensitive, so each thread gets its own seeded PRNG
+# instead of reading /dev/urandom per pick; tokens still come from secrets.
+_thread_rng = threading.local()
+# In-memory fallback store, sharded by token so unrelated sessions don't contend on one lock.
+memory_session_shards: List[Dict[str, Dict[str, Any]]] = [{} for _ in range(MEMORY_SESSION_SHARDS)]
+# Per-shard min-heaps of (expires, token); entries whose expiry no longer matches the shard are stale.
+_expiry_heaps: List[List[Tuple[float, str]]] = [[] for _ in range(MEMORY_SESSION_SHARDS)]
+# Single dict get/set/pop calls are atomic under the GIL, so reads and deletes skip the
+# shard lock; it only pairs a write with its heap push and guards cleanup/snapshots.
+_shard_locks = [threading.Lock() for _ in range(MEMORY_SESSION_SHARDS)]
+# Lets one thread at a time trim the store back to MAX_MEMORY_SESSIONS.
+_eviction_lock = threading.Lock()
+
+# Sessions are stored in Redis as raw msgpack bytes (no text decoding on the pool).
+_session_encoder = msgspec.msgpack.Encoder()
+_session_decoder = msgspec.msgpack.Decoder(dict)
+
+SECURITY_HEADERS = {
+    'Strict-Transport-Security': 'max-age=31536000; includeSubDomains',
+    'X-Content-Type-Options': 'nosniff',
+    'X-Frame-Options': 'DENY',
+    'Content-Security-Policy': "default-src 'self'",
+    'Referrer-Policy': 'strict-origin-when-cross-origin'
+}
 
 @app.after_request
 def add_security_headers(response):
-    response.headers['Strict-Transport-Security'] = 'max-age=31536000; includeSubDomains'
-    response.headers['X-Content-Type-Options'] = 'nosniff'
-    response.headers['X-Frame-Options'] = 'DENY'
-    response.headers['Content-Security-Policy'] = "default-src 'self'"
-    response.headers['Referrer-Policy'] = 'strict-origin-when-cross-origin'
-    response.headers['X-Request-ID'] = str(uuid4())
+    response.headers.update(SECURITY_HEADERS)
+    response.headers['X-Request-ID'] = secrets.token_hex(16)
     return response
 
 # -----------------------
@@ -182,84 +214,120 @@ def internal_error_handler(e):
 # -----------------------
 # Session Management
 # -----------------------
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10))
 def store_session(session: Dict[str, Any]) -> None:
     """Store session with metrics integration."""
     try:
         session_trap_depth_distribution.observe(session.get('trap_depth', 0))
         if redis_conn:
-            serialized = json.dumps(session)
-            redis_conn.setex(f"session:{session['token']}", SESSION_EXPIRY_SECONDS, serialized)
+            serialized = _session_encoder.encode(session)
+            pipe = redis_conn.pipeline(transaction=False)
+            pipe.setex(f"session:{session['token']}", SESSION_EXPIRY_SECONDS, serialized)
             if session.get('trap_depth', 0) > 3:
-                redis_conn.zadd("trap_depths", {session['token']: session['trap_depth']})
+                pipe.zadd("trap_depths", {session['token']: session['trap_depth']})
+            else:
+                pipe.zrem("trap_depths", session['token'])
+            pipe.execute()
         else:
-            with session_cleanup_lock:
-                memory_sessions[session['token']] = {
-                    'data': session,
-                    'expires': time.time() + SESSION_EXPIRY_SECONDS
-                }
-            cleanup_memory_sessions()
+            store_memory_session(session)
+            cleanup_memory_sessions(session_shard(session['token']))
     except Exception as e:
         logger.error(f"Failed to store session: {e}")
-        with session_cleanup_lock:
-            memory_sessions[session['token']] = {
-                'data': session,
-                'expires': time.time() + SESSION_EXPIRY_SECONDS
-            }
+        store_memory_session(session)
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10))
 def get_session(token: str) -> Optional[Dict[str, Any]]:
     """Retrieve session from storage."""
     try:
         if redis_conn:
             data = redis_conn.get(f"session:{token}")
-            if data:
-                return json.loads(data)
-            return None
+            if not data:
+                return None
+            try:
+                return _session_decoder.decode(data)
+            except msgspec.DecodeError:
+                # Legacy JSON/pickle blobs are dropped rather than deserialized; the client starts over.
+                logger.warning("Discarding undecodable session blob")
+                redis_conn.delete(f"session:{token}")
+                return None
         else:
-            with session_cleanup_lock:
-                session_data = memory_sessions.get(token)
-                if session_data and session_data['expires'] > time.time():
-                    return session_data['data']
-                elif session_data:
-                    del memory_sessions[token]
+            session_data = memory_session_shards[session_shard(token)].get(token)
+            if session_data and session_data['expires'] > time.time():
+                return session_data['data']
             return None
     except Exception as e:
         logger.error(f"Failed to get session: {e}")
         return None
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10))
 def delete_session(token: str) -> None:
     """Delete session from storage."""
     try:
         if redis_conn:
-            redis_conn.delete(f"session:{token}")
-            redis_conn.zrem("trap_depths", token)
+            pipe = redis_conn.pipeline(transaction=False)
+            pipe.delete(f"session:{token}")
+            pipe.zrem("trap_depths", token)
+            pipe.execute()
         else:
-            with session_cleanup_lock:
-                memory_sessions.pop(token, None)
+            memory_session_shards[session_shard(token)].pop(token, None)
     except Exception as e:
         logger.error(f"Failed to delete session: {e}")
 
-def cleanup_memory_sessions() -> None:
-    """Remove expired sessions from memory storage."""
-    with session_cleanup_lock:
-        current_time = time.time()
-        expired_tokens = [
-            token for token, data in memory_sessions.items()
-            if data['expires'] <= current_time
-        ]
-        for token in expired_tokens:
-            del memory_sessions[token]
-
-        if len(memory_sessions) > 10000:
-            sorted_sessions = sorted(
-                memory_sessions.items(),
-                key=lambda x: x[1]['expires']
-            )
-            to_remove = len(sorted_sessions) // 5
-            for token, _ in sorted_sessions[:to_remove]:
-                del memory_sessions[token]
+def session_shard(token: str) -> int:
+    """Return the in-memory shard index for a session token."""
+    return hash(token) % MEMORY_SESSION_SHARDS
+
+def memory_session_count() -> int:
+    """Return the number of sessions held in memory."""
+    return sum(len(sessions) for sessions in memory_session_shards)
+
+def store_memory_session(session: Dict[str, Any]) -> None:
+    """Store session in memory and schedule its expiry."""
+    token = session['token']
+    shard = session_shard(token)
+    expires = time.time() + SESSION_EXPIRY_SECONDS
+    with _shard_locks[shard]:
+        memory_session_shards[shard][token] = {
+            'data': session,
+            'expires': expires
+        }
+        heapq.heappush(_expiry_heaps[shard], (expires, token))
+
+def pop_oldest_memory_session(shard: int) -> bool:
+    """Pop the shard's earliest expiry entry; return True if it removed a live session. Caller holds the shard lock."""
+    expires, token = heapq.heappop(_expiry_heaps[shard])
+    sessions = memory_session_shards[shard]
+    data = sessions.get(token)
+    if data and data['expires'] == expires:
+        del sessions[token]
+        return True
+    return False
+
+def cleanup_memory_sessions(shard: Optional[int] = None) -> None:
+    """Remove expired sessions from memory storage, evicting the oldest when over capacity."""
+    current_time = time.time()
+    for idx in (range(MEMORY_SESSION_SHARDS) if shard is None else (shard,)):
+        heap = _expiry_heaps[idx]
+        with _shard_locks[idx]:
+            while heap and heap[0][0] <= current_time:
+                pop_oldest_memory_session(idx)
+    # MAX_MEMORY_SESSIONS caps all shards together, so evict the oldest sessions across shards.
+    excess = memory_session_count() - MAX_MEMORY_SESSIONS
+    if excess <= 0 or not _eviction_lock.acquire(blocking=False):
+        return
+    try:
+        while excess > 0:
+            heads = []
+            for idx, heap in enumerate(_expiry_heaps):
+                # heap[:1] peeks without the lock and never raises on a concurrently emptied heap.
+                head = heap[:1]
+                if head:
+                    heads.append((head[0][0], idx))
+            if not heads:
+                break
+            _, idx = min(heads)
+            with _shard_locks[idx]:
+                if _expiry_heaps[idx] and pop_oldest_memory_session(idx):
+                    excess -= 1
+    finally:
+        _eviction_lock.release()
 
 # -----------------------
 # Utilities
@@ -274,57 +342,84 @@ def mk_token() -> str:
 
 def quantum_hash(s: str) -> str:
     """Generate a short hash for challenge context."""
-    h = hashlib.sha256(s.encode()).digest()
-    return ''.join(f"{b:02x}" for b in h[:8])
-
-def recursive_hash(seed: str, depth: int = 3) -> str:
-    """Generate recursive hash for round IDs."""
-    for _ in range(depth):
-        seed = hashlib.sha256(seed.encode()).hexdigest()[:16]
-    return seed
-
-def canonical_json_obj(obj: Any) -> str:
-    """Create canonical JSON string for signing."""
-    return json.dumps(obj, separators=(',', ':'), sort_keys=True)
-
-def generate_hmac_signature(payload_obj: Any) -> str:
-    """Generate HMAC signature for payload."""
-    payload = canonical_json_obj(payload_obj).encode()
-    return hmac.new(HMAC_SECRET, payload, hashlib.sha256).hexdigest()
-
-def verify_hmac_signature(payload_obj: Any, signature: str) -> bool:
-    """Verify HMAC signature for payload."""
+    return hashlib.blake2b(s.encode(), digest_size=8).hexdigest()
+
+def generate_hmac_signature(payload: bytes) -> str:
+    """Generate HMAC signature for raw payload bytes."""
+    return hmac.digest(HMAC_SECRET, payload, 'sha256').hex()
+
+def verify_hmac_signature(payload: bytes, signature: str) -> bool:
+    """Verify HMAC signature for raw payload bytes."""
+    # Reject anything that isn't a hex SHA-256 digest before hashing the payload.
+    if not isinstance(signature, str) or len(signature) != 64:
+        return False
     try:
-        expected = generate_hmac_signature(payload_obj)
-        return hmac.compare_digest(expected, signature)
+        client_digest = bytes.fromhex(signature)
+    except ValueError:
+        return False
+    try:
+        return hmac.compare_digest(hmac.digest(HMAC_SECRET, payload, 'sha256'), client_digest)
     except Exception as e:
         logger.error(f"HMAC verification failed: {e}")
         return False
 
+def thread_rng() -> random.Random:
+    """Return this thread's PRNG, seeding it from the OS CSPRNG on first use."""
+    rng = getattr(_thread_rng, "rng", None)
+    if rng is None:
+        rng = _thread_rng.rng = random.Random(secrets.randbits(128))
+    return rng
+
 def safe_random_choice(items: List[Any]) -> Any:
-    """Thread-safe random choice using SystemRandom."""
-    with _rng_lock:
-        return random.SystemRandom().choice(items)
+    """Thread-safe random choice using a per-thread PRNG."""
+    return thread_rng().choice(items)
 
 # -----------------------
 # Challenge Factories
 # -----------------------
-def challenge_creative_input(session: Dict[str, Any]) -> Dict[str, Any]:
-    """Generate creative input challenge."""
-    _ = session  # Explicitly unused
-    return {
+# Challenges that never depend on session state; factories hand out shallow copies.
+STATIC_CHALLENGES: Dict[str, Dict[str, Any]] = {
+    "creative_input": {
         "type": "creative_input",
         "text": "Name something that doesn't exist but should",
         "input": True,
         "validator_key": "creative_input",
         "context": {}
+    },
+    "temporal_paradox": {
+        "type": "temporal_paradox",
+        "text": "You solved this 5 seconds ago. What was your answer?",
+        "input": True,
+        "validator_key": "temporal_paradox",
+        "context": {}
+    },
+    "infinite_regress": {
+        "type": "infinite_regress",
+        "text": "The correct answer is the first option of the next challenge",
+        "options": ["Continue"],
+        "input": False,
+        "validator_key": "infinite_regress",
+        "context": {}
     }
+}
+# Server-side fields that never leave the process.
+_PRIVATE_CHALLENGE_KEYS = frozenset(("context", "validator_key"))
+
+_STATIC_SANITIZED: Dict[str, Dict[str, Any]] = {
+    key: {k: v for k, v in template.items() if k not in _PRIVATE_CHALLENGE_KEYS}
+    for key, template in STATIC_CHALLENGES.items()
+}
+
+def challenge_creative_input(session: Dict[str, Any]) -> Dict[str, Any]:
+    """Generate creative input challenge."""
+    _ = session  # Explicitly unused
+    return dict(STATIC_CHALLENGES["creative_input"])
 
 def challenge_meta_loop(session: Dict[str, Any]) -> Dict[str, Any]:
     """Generate meta loop challenge referencing previous answers."""
-    prev_answers = [r["result"]["answer"] for r in session["rounds"] if r.get("result")]
+    prev_answers = session["prev_answers"][-QUANTUM_ENTANGLEMENT_DEPTH:]
     if prev_answers:
-        ref_answer = safe_random_choice(prev_answers[-QUANTUM_ENTANGLEMENT_DEPTH:])
+        ref_answer = safe_random_choice(prev_answers)
         ref_hash = quantum_hash(ref_answer)
         return {
             "type": "meta_loop",
@@ -362,25 +457,12 @@ def challenge_quantum_state(session: Dict[str, Any]) -> Dict[str, Any]:
 def challenge_temporal_paradox(session: Dict[str, Any]) -> Dict[str, Any]:
     """Generate temporal paradox challenge."""
     _ = session  # Explicitly unused
-    return {
-        "type": "temporal_paradox",
-        "text": "You solved this 5 seconds ago. What was your answer?",
-        "input": True,
-        "validator_key": "temporal_paradox",
-        "context": {}
-    }
+    return dict(STATIC_CHALLENGES["temporal_paradox"])
 
 def challenge_infinite_regress(session: Dict[str, Any]) -> Dict[str, Any]:
     """Generate infinite regress challenge."""
     _ = session  # Explicitly unused
-    return {
-        "type": "infinite_regress",
-        "text": "The correct answer is the first option of the next challenge",
-        "options": ["Continue"],
-        "input": False,
-        "validator_key": "infinite_regress",
-        "context": {}
-    }
+    return dict(STATIC_CHALLENGES["infinite_regress"])
 
 ALL_CHALLENGE_FACTORIES: List[Callable[[Dict[str, Any]], Dict[str, Any]]] = [
     challenge_meta_loop,
@@ -390,6 +472,9 @@ ALL_CHALLENGE_FACTORIES: List[Callable[[Dict[str, Any]], Dict[str, Any]]] = [
     challenge_infinite_regress,
     challenge_creative_input
 ]
+# Trap-mode selection weights, aligned with ALL_CHALLENGE_FACTORIES.
+TRAP_FACTORY_WEIGHTS: Tuple[int, ...] = (1, 1, 3, 3, 2, 3)
+_TRAP_FACTORY_CUM_WEIGHTS = tuple(itertools.accumulate(TRAP_FACTORY_WEIGHTS))
 
 # -----------------------
 # Validators
@@ -409,14 +494,13 @@ def validate_meta_loop(answer: str, meta: Dict[str, Any], session: Dict[str, Any
     if not isinstance(answer, str) or len(answer) == 0:
         return 1, "invalid answer type", 0.8
     prev_answers = context.get("prev_answers", [])
-    similarity = 0
     if prev_answers:
         target = prev_answers[-min(QUANTUM_ENTANGLEMENT_DEPTH, len(prev_answers))]
-        if isinstance(target, str) and len(target) > 0:
-            for i in range(min(len(answer), len(target))):
-                if answer[i] == target[i]:
-                    similarity += 1
-            similarity_score = similarity / max(len(target), 1)
+        # Matches are bounded by the shorter string, so skip the comparison when even a
+        # perfect overlap couldn't clear the 0.2 human-recall floor.
+        if isinstance(target, str) and min(len(answer), len(target)) > 0.2 * len(target):
+            similarity = sum(map(operator.eq, answer, target))
+            similarity_score = similarity / len(target)
         else:
             similarity_score = 0
     else:
@@ -428,7 +512,7 @@ def validate_meta_loop(answer: str, meta: Dict[str, Any], session: Dict[str, Any
 def validate_recursive_paradox(answer: str, meta: Dict[str, Any], session: Dict[str, Any], context: Dict[str, Any]) -> Tuple[int, str, float]:
     """Validate recursive paradox challenge."""
     round_num = context["round_num"]
-    correct_count = sum(1 for r in session["rounds"] if r.get("result", {}).get("human_score", 0) >= 3)
+    correct_count = session["correct_count"]
     if answer == f"{round_num}":
         valid = correct_count == round_num
     elif answer == "True":
@@ -456,13 +540,7 @@ def validate_temporal_paradox(answer: str, meta: Dict[str, Any], session: Dict[s
     """Validate temporal paradox challenge."""
     time_elapsed = now_ts() - session["created_at"]
     imagined_past = time_elapsed - 5
-    closest = None
-    for r in session["rounds"]:
-        if not r.get("result"):
-            continue
-        time_diff = abs(r["result"]["answered_at"] - imagined_past)
-        if closest is None or time_diff < closest[0]:
-            closest = (time_diff, r["result"]["answer"])
+    closest = min(session["answered_timestamps"], key=lambda t: abs(t[0] - imagined_past), default=None)
     if closest and answer == closest[1]:
         return 2, "time match", 0.5
     return 3, "human time variance", 0.3
@@ -480,6 +558,16 @@ VALIDATORS = {
     "infinite_regress": validate_infinite_regress
 }
 
+# Label children for every known challenge type, resolved once instead of per scored round.
+_ROUND_COUNTERS = {
+    (challenge_type, trap_mode): rounds_total.labels(type=challenge_type, trap_mode=trap_mode)
+    for challenge_type in VALIDATORS for trap_mode in ("trap", "normal")
+}
+_SUCCESS_COUNTERS = {
+    (challenge_type, success): challenge_success.labels(type=challenge_type, success=success)
+    for challenge_type in VALIDATORS for success in ("pass", "fail")
+}
+
 # -----------------------
 # Core Logic
 # -----------------------
@@ -488,12 +576,9 @@ def pick_challenge(session: Dict[str, Any], trap: bool = False) -> Dict[str, Any
     future = session.get("quantum_future", "random")
     try:
         if trap:
-            available_factories = ALL_CHALLENGE_FACTORIES
-            weights = [1, 1, 3, 3, 2, 3][:len(available_factories)]
-            factories = random.choices(available_factories, weights, k=min(5, len(available_factories)))
+            challenge_factory = thread_rng().choices(ALL_CHALLENGE_FACTORIES, cum_weights=_TRAP_FACTORY_CUM_WEIGHTS)[0]
         else:
-            factories = ALL_CHALLENGE_FACTORIES
-        challenge_factory = safe_random_choice(factories)
+            challenge_factory = safe_random_choice(ALL_CHALLENGE_FACTORIES)
         challenge = challenge_factory(session)
     except Exception as e:
         logger.error(f"Error creating challenge: {e}")
@@ -516,36 +601,66 @@ def score_round(session: Dict[str, Any], challenge: Dict[str, Any], answer: str,
         return 2, f"validator error: {str(e)}", 0.5
     challenge_type = challenge["type"]
     trap_mode = "trap" if challenge.get("time_dilation") else "normal"
-    rounds_total.labels(type=challenge_type, trap_mode=trap_mode).inc()
+    success = "pass" if human_score >= 3 else "fail"
+    round_counter = _ROUND_COUNTERS.get((challenge_type, trap_mode))
+    if round_counter is None:
+        round_counter = rounds_total.labels(type=challenge_type, trap_mode=trap_mode)
+    round_counter.inc()
     bot_likelihood_score.observe(bot_likelihood)
-    challenge_success.labels(type=challenge_type, success="pass" if human_score >= 3 else "fail").inc()
-    if challenge.get("time_dilation"):
-        time_ms = meta.get("time_ms", 0)
-        expected_time = time_ms / challenge["time_dilation"]
+    success_counter = _SUCCESS_COUNTERS.get((challenge_type, success))
+    if success_counter is None:
+        success_counter = challenge_success.labels(type=challenge_type, success=success)
+    success_counter.inc()
+    time_dilation = challenge.get("time_dilation")
+    time_ms = meta.get("time_ms", 0)
+    if time_dilation:
+        expected_time = time_ms / time_dilation
         if abs(time_ms - expected_time) > BOT_TIMING_TOLERANCE_MS:
             bot_likelihood = min(1.0, bot_likelihood + 0.3)
     recursion_depth = len(session["rounds"])
     if recursion_depth > RECURSION_DEPTH_WARNING:
-        if human_score > 3 and meta.get("time_ms", 0) < 1500:
+        if human_score > 3 and time_ms < 1500:
             bot_likelihood = min(1.0, bot_likelihood + 0.2 * (recursion_depth / 10))
     return human_score, explanation, bot_likelihood
 
-def create_round(session: Dict[str, Any], challenge: Dict[str, Any]) -> Dict[str, Any]:
-    """Create a new challenge round."""
-    round_id = recursive_hash(session["token"] + str(len(session["rounds"])))
+def index_rounds(session: Dict[str, Any]) -> None:
+    """Rebuild the round lookup caches after the stored rounds change."""
+    session["round_index"] = {r["round_id"]: i for i, r in enumerate(session["rounds"])}
+    answered = [r["result"] for r in session["rounds"] if r.get("result")]
+    session["answered_timestamps"] = [(res["answered_at"], res["answer"]) for res in answered]
+    session["prev_answers"] = [res["answer"] for res in answered]
+    session["correct_count"] = sum(1 for res in answered if res["human_score"] >= 3)
+
+def record_result(session: Dict[str, Any], round_obj: Dict[str, Any], result: Dict[str, Any]) -> None:
+    """Attach a scored result to its round and update the session caches."""
+    round_obj["result"] = result
+    session["answered_timestamps"].append((result["answered_at"], result["answer"]))
+    session["prev_answers"].append(result["answer"])
+    if result["human_score"] >= 3:
+        session["correct_count"] += 1
+
+def create_round(session: Dict[str, Any], challenge: Dict[str, Any], now: Optional[float] = None) -> Dict[str, Any]:
+    """Create a new challenge round, stamped with the caller's request time if given."""
+    rounds = session["rounds"]
+    if now is None:
+        now = now_ts()
+    round_id = secrets.token_urlsafe(12)
     round_obj = {
         "round_id": round_id,
-        "issued_at": now_ts(),
+        "issued_at": now,
         "challenge": challenge,
         "result": None
     }
-    session["rounds"].append(round_obj)
-    if len(session["rounds"]) > MAX_STORED_ROUNDS:
-        session["rounds"] = session["rounds"][-MAX_STORED_ROUNDS:]
-    session["last_seen"] = now_ts()
+    rounds.append(round_obj)
+    if len(rounds) > MAX_STORED_ROUNDS:
+        del rounds[:-MAX_STORED_ROUNDS]
+        index_rounds(session)
+    else:
+        session["round_index"][round_id] = len(rounds) - 1
+    session["last_seen"] = now
     return round_obj
 
-def paradox_decide_next(session: Dict[str, Any], latest_round: Dict[str, Any]) -> Tuple[bool, str, Optional[Dict[str, Any]], Optional[str]]:
+def paradox_decide_next(session: Dict[str, Any], latest_round: Dict[str, Any], now: Optional[float] = None) -> Tuple[bool, str, Optional[Dict[str, Any]], Optional[str]]:
     """Determine next action based on round result."""
     res = latest_round["result"]
     round_num = len(session["rounds"])
@@ -554,12 +669,21 @@ def paradox_decide_next(session: Dict[str, Any], latest_round: Dict[str, Any]) -
         session["consecutive_passes"] += 1
     else:
         session["consecutive_passes"] = 0
+    trap_depth = session.get("trap_depth", 0)
     if res["bot_likelihood"] >= TRAP_MODE_THRESHOLD:
         session["trap_mode"] = True
-        session["trap_depth"] = session.get("trap_depth", 0) + 1
-    if session.get("trap_depth", 0) > 3:
+        trap_depth += 1
+    if round_num > 15 and trap_depth > 3 and not session.get("accepted"):
+        # Loop breaker, formerly the monitor's 30s sweep: shed at most one level per interval.
+        if now is None:
+            now = now_ts()
+        if now - session.get("loop_broken_at", 0) >= LOOP_BREAK_INTERVAL_SECONDS:
+            trap_depth -= 1
+            session["loop_broken_at"] = now
+    session["trap_depth"] = trap_depth
+    if trap_depth > 3:
         next_ch = challenge_infinite_regress(session)
-        next_round = create_round(session, next_ch)
+        next_round = create_round(session, next_ch, now)
         return False, "deep_trap", sanitize_challenge(next_ch), next_round["round_id"]
     if session["consecutive_passes"] >= REQUIRED_CONSECUTIVE_PASSES:
         session["accepted"] = True
@@ -570,78 +694,77 @@ def paradox_decide_next(session: Dict[str, Any], latest_round: Dict[str, Any]) -
         session["accepted"] = True
         return True, "accepted_after_limit", None, None
     next_ch = pick_challenge(session, trap=session["trap_mode"])
-    next_round = create_round(session, next_ch)
+    next_round = create_round(session, next_ch, now)
     return False, "continue", sanitize_challenge(next_ch), next_round["round_id"]
 
 def sanitize_challenge(challenge: Dict[str, Any]) -> Dict[str, Any]:
     """Sanitize challenge for client response."""
-    sanitized = challenge.copy()
-    sanitized.pop("context", None)
-    sanitized.pop("validator_key", None)
-    return sanitized
+    if "time_dilation" not in challenge and challenge.get("type") in _STATIC_SANITIZED:
+        return _STATIC_SANITIZED[challenge["type"]]
+    return {k: v for k, v in challenge.items() if k not in _PRIVATE_CHALLENGE_KEYS}
 
 def monitor_recursion_loops() -> None:
-    """Monitor sessions with high trap depth."""
+    """Prune expired deep-trap sessions and report how many remain."""
     while True:
         try:
             time.sleep(30)
             if redis_conn:
-                deep_trap_sessions = redis_conn.zrangebyscore("trap_depths", 3, float('inf'))
-                for token in deep_trap_sessions:
-                    try:
-                        data = redis_conn.get(f"session:{token}")
-                        if not data:
-                            redis_conn.zrem("trap_depths", token)
-                            continue
-                        session = json.loads(data)
-                        if len(session["rounds"]) > 15 and session.get("trap_depth", 0) > 3 and not session.get("accepted"):
-                            session["rounds"] = session["rounds"][-MAX_STORED_ROUNDS:]
-                            session["trap_depth"] = max(0, session["trap_depth"] - 1)
-                            store_session(session)
-                    except Exception as e:
-                        logger.error(f"Error processing session {token}: {e}")
+                tokens = [t.decode() for t in redis_conn.zrangebyscore("trap_depths", "(3", "+inf")]
+                checks = redis_conn.pipeline(transaction=False)
+                for token in tokens:
+                    checks.exists(f"session:{token}")
+                expired = [token for token, alive in zip(tokens, checks.execute()) if not alive]
+                if expired:
+                    redis_conn.zrem("trap_depths", *expired)
+                deep_trap_sessions.set(len(tokens) - len(expired))
             else:
                 cleanup_memory_sessions()
-                with session_cleanup_lock:
-                    sessions_to_process = list(memory_sessions.items())
-                for token, data in sessions_to_process:
-                    try:
-                        session = data['data']
-                        if len(session["rounds"]) > 15 and session.get("trap_depth", 0) > 3 and not session.get("accepted"):
-                            session["rounds"] = session["rounds"][-MAX_STORED_ROUNDS:]
-                            session["trap_depth"] = max(0, session["trap_depth"] - 1)
-                            with session_cleanup_lock:
-                                if token in memory_sessions:
-                                    memory_sessions[token]['data'] = session
-                    except Exception as e:
-                        logger.error(f"Error processing memory session {token}: {e}")
+                deep_trap_count = 0
+                for shard, sessions in enumerate(memory_session_shards):
+                    with _shard_locks[shard]:
+                        deep_trap_count += sum(1 for data in sessions.values() if data['data'].get("trap_depth", 0) > 3)
+                deep_trap_sessions.set(deep_trap_count)
         except Exception as e:
             logger.error(f"Monitor loop error: {e}")
 
 # -----------------------
 # Session Management
 # -----------------------
-def new_session() -> Dict[str, Any]:
-    """Create a new session."""
+def new_session(now: Optional[float] = None) -> Dict[str, Any]:
+    """Create a new session. Callers must store_session() it once fully initialized."""
+    if now is None:
+        now = now_ts()
     token = mk_token()
     session = {
         "token": token,
-        "created_at": now_ts(),
-        "expiry": now_ts() + SESSION_EXPIRY_SECONDS,
+        "created_at": now,
+        "expiry": now + SESSION_EXPIRY_SECONDS,
         "rounds": [],
+        "round_index": {},
+        "answered_timestamps": [],
+        "prev_answers": [],
+        "correct_count": 0,
         "consecutive_passes": 0,
         "trap_mode": False,
         "trap_depth": 0,
         "accepted": False,
-        "last_seen": now_ts()
+        "last_seen": now
     }
     sessions_total.inc()
-    store_session(session)
     return session
 
 # -----------------------
 # API Endpoints
 # -----------------------
+class RespondPayload(msgspec.Struct):
+    """Signed JSON body of a /respond request."""
+    token: str
+    round_id: str
+    answer: Annotated[str, msgspec.Meta(max_length=MAX_ANSWER_LENGTH)] = ""
+    meta: Optional[Dict[str, Any]] = None
+
+_respond_decoder = msgspec.json.Decoder(RespondPayload)
+
 @app.route("/session", methods=["POST"])
 @limiter.limit("5 per minute")
 def api_new_session():
@@ -667,15 +790,16 @@ def api_new_session():
           description: Internal server error
     """
     try:
-        session = new_session()
+        now = now_ts()
+        session = new_session(now)
         challenge = pick_challenge(session)
-        round_obj = create_round(session, challenge)
+        round_obj = create_round(session, challenge, now)
         store_session(session)
         return jsonify({
             "token": session["token"],
             "challenge": sanitize_challenge(challenge),
             "round_id": round_obj["round_id"],
-            "expires_in": int(session["expiry"] - now_ts())
+            "expires_in": SESSION_EXPIRY_SECONDS
         })
     except Exception as e:
         logger.error(f"Error creating session: {e}", exc_info=True)
@@ -725,52 +849,51 @@ def api_respond():
           description: Internal server error
     """
     try:
-        payload = request.get_json(force=True)
-        if not payload:
-            abort(400, "Invalid JSON payload")
-        token = payload.get("token")
+        now = now_ts()
+        # Clients sign the exact request body, so verify against the raw bytes.
+        raw = request.get_data(cache=True)
+        try:
+            payload = _respond_decoder.decode(raw)
+        except msgspec.DecodeError as e:
+            abort(400, f"Invalid payload: {e}")
+        token = payload.token
         if not token:
             abort(400, "Missing token")
         client_signature = request.headers.get("X-Payload-Signature")
         if not client_signature:
             abort(403, "Missing X-Payload-Signature header")
-        if not verify_hmac_signature(payload, client_signature):
+        if not verify_hmac_signature(raw, client_signature):
             abort(403, "Invalid signature")
         session = get_session(token)
         if not session:
             abort(404, "Session not found or expired")
-        round_id = payload.get("round_id")
+        round_id = payload.round_id
         if not round_id:
             abort(400, "Missing round_id")
-        round_obj = next((r for r in session["rounds"] if r["round_id"] == round_id), None)
+        round_idx = session["round_index"].get(round_id)
+        round_obj = session["rounds"][round_idx] if round_idx is not None else None
         if not round_obj:
             abort(404, "Round not found")
         if round_obj.get("result"):
             abort(400, "Round already answered")
-        answer = payload.get("answer", "")
-        if not isinstance(answer, str):
-            abort(400, "Answer must be string")
-        if len(answer) > MAX_ANSWER_LENGTH:
-            abort(400, f"Answer too long (max {MAX_ANSWER_LENGTH})")
-        meta = payload.get("meta", {})
-        if not isinstance(meta, dict):
-            meta = {}
+        answer = payload.answer
+        meta = payload.meta or {}
         human_score, explanation, bot_likelihood = score_round(session, round_obj["challenge"], answer, meta)
-        round_obj["result"] = {
-            "answered_at": now_ts(),
+        record_result(session, round_obj, {
+            "answered_at": now,
             "answer": answer,
             "meta": meta,
             "human_score": human_score,
             "explanation": explanation,
             "bot_likelihood": bot_likelihood
-        }
-        accepted, action, next_challenge, next_round_id = paradox_decide_next(session, round_obj)
+        })
+        accepted, action, next_challenge, next_round_id = paradox_decide_next(session, round_obj, now)
         store_session(session)
         response = {
             "round_result": {
-                "human_score": round_obj["result"]["human_score"],
-                "explanation": round_obj["result"]["explanation"],
-                "bot_likelihood": round_obj["result"]["bot_likelihood"]
+                "human_score": human_score,
+                "explanation": explanation,
+                "bot_likelihood": bot_likelihood
             },
             "accepted": accepted,
             "action": action,
@@ -781,10 +904,10 @@ def api_respond():
             response["next_challenge"] = next_challenge
             response["next_round_id"] = next_round_id
         return jsonify(response)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in respond endpoint: {e}", exc_info=True)
-        if isinstance(e, tuple):
-            raise
         abort(500)
 
 @app.route("/health", methods=["GET"])
@@ -794,7 +917,7 @@ def health_check():
         "status": "healthy",
         "timestamp": now_ts(),
         "redis_connected": redis_conn is not None,
-        "active_sessions": len(memory_sessions) if not redis_conn else "redis"
+        "active_sessions": memory_session_count() if not redis_conn else "redis"
     })
 
 @app.route('/metrics')
@@ -818,5 +941,8 @@ def start_background_threads():
 # Entry Point
 # -----------------------
 if __name__ == "__main__":
+    # Development only; production runs under gunicorn -c gunicorn_conf.py, which owns worker signals
+    signal.signal(signal.SIGTERM, cleanup_resources)
+    signal.signal(signal.SIGINT, cleanup_resources)
     start_background_threads()
     app.run(host="0.0.0.0", port=5000, threaded=True)
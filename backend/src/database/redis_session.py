@@ -4,7 +4,7 @@ hiredis==2.2.3
 
 # paradox_loop_server.py
 import redis
-import pickle
+import msgspec
 import os
 
 # Initialize Redis connection
@@ -13,13 +13,13 @@ redis_conn = redis.from_url(REDIS_URL, decode_responses=False)
 
 def store_session(token, session_data, expiry=SESSION_EXPIRY):
     """Securely store session in Redis"""
-    serialized = pickle.dumps(session_data)
+    serialized = msgspec.msgpack.encode(session_data)
     redis_conn.setex(f"session:{token}", expiry, serialized)
 
 def get_session(token):
     """Retrieve session from Redis"""
     serialized = redis_conn.get(f"session:{token}")
-    return pickle.loads(serialized) if serialized else None
+    return msgspec.msgpack.decode(serialized) if serialized else None
 
 def delete_session(token):
     """Remove session from Redis"""
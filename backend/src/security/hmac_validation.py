@@ -1,29 +1,65 @@
-import hmac
+"""HMAC-SHA256 request signing helpers.
+
+Wire into a Flask route by verifying the exact bytes the client signed:
+
+    @app.route("/respond", methods=["POST"])
+    def api_respond():
+        raw = request.get_data(cache=True)
+        client_signature = request.headers.get("X-Payload-Signature")
+        if not client_signature or not verify_hmac_signature(raw, client_signature):
+            abort(403, "Payload signature verification failed")
+        payload = request.get_json(force=True)
+        ...
+"""
+import os
 import hashlib
-import base64
+import secrets
+
+def _load_key():
+    """Load the HMAC secret as bytes, failing fast if production has none"""
+    raw = os.environ.get("HMAC_SECRET")
+    if raw is None:
+        if os.environ.get("FLASK_ENV") == "production":
+            raise RuntimeError("HMAC_SECRET required")
+        # Per-process dev key: signatures will not verify across workers
+        return secrets.token_bytes(32)
+    return raw.encode()
+
+# Secret key (store in environment)
+SECRET_KEY = _load_key()
 
-# Generate secret key (store in environment)
-SECRET_KEY = os.environ.get("HMAC_SECRET", secrets.token_bytes(32))
+def _keyed_states(key):
+    """Precompute the HMAC-SHA256 inner/outer hash states for key"""
+    block_size = hashlib.sha256().block_size
+    if len(key) > block_size:
+        key = hashlib.sha256(key).digest()
+    key = key.ljust(block_size, b"\0")
+    inner = hashlib.sha256(bytes(b ^ 0x36 for b in key))
+    outer = hashlib.sha256(bytes(b ^ 0x5C for b in key))
+    return inner, outer
+
+# Key padding is done once; each signature only clones the two hash states
+_INNER, _OUTER = _keyed_states(SECRET_KEY)
+
+def hmac_digest(payload):
+    """Compute the raw HMAC-SHA256 digest of payload bytes"""
+    inner = _INNER.copy()
+    inner.update(payload)
+    outer = _OUTER.copy()
+    outer.update(inner.digest())
+    return outer.digest()
 
 def generate_hmac_signature(payload):
-    """Generate HMAC signature for payload"""
-    if isinstance(payload, str):
-        payload = payload.encode()
-    return hmac.new(SECRET_KEY, payload, hashlib.sha256).hexdigest()
+    """Generate hex HMAC signature for payload bytes, as sent by clients"""
+    return hmac_digest(payload).hex()
 
 def verify_hmac_signature(payload, signature):
-    """Verify HMAC signature"""
-    expected = generate_hmac_signature(payload)
-    return hmac.compare_digest(expected, signature)
-
-# In api_respond()
-@app.route("/respond", methods=["POST"])
-def api_respond():
-    payload = request.get_json(force=True)
-    
-    # Verify HMAC signature
-    client_signature = request.headers.get("X-Payload-Signature")
-    if not verify_hmac_signature(json.dumps(payload), client_signature):
-        abort(403, "Payload signature verification failed")
-    
-    ... # existing logic
+    """Verify a hex HMAC signature against the raw digest"""
+    if len(signature) != 2 * hashlib.sha256().digest_size:
+        return False
+    try:
+        client_digest = bytes.fromhex(signature)
+    except ValueError:
+        return False
+    return secrets.compare_digest(hmac_digest(payload), client_digest)
+
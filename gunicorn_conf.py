@@ -0,0 +1,28 @@
+"""Gunicorn settings for the Paradox Loop CAPTCHA server.
+
+Run with: gunicorn -c gunicorn_conf.py
+
+By default this starts 2*CPU+1 worker processes with 8 threads each, and every
+worker runs its own monitor thread that sweeps Redis every 30s. Set
+WEB_CONCURRENCY and GUNICORN_THREADS to size it for the host.
+"""
+import multiprocessing
+import os
+
+wsgi_app = "paradox_loop_server:app"
+chdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend", "src", "captcha")
+bind = os.getenv("BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+# Threaded workers keep the server's threading model (shard locks, per-thread RNG) while
+# overlapping Redis round-trips within each process.
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+
+def post_worker_init(worker):
+    """Start the monitor in each worker, since /metrics is served per process."""
+    import paradox_loop_server
+    # Without Redis, sessions and rate limits live in each worker's memory, so a session created
+    # on one worker would 404 on the others. Failing here makes gunicorn halt on boot.
+    if paradox_loop_server.redis_conn is None and worker.cfg.workers > 1:
+        raise RuntimeError("Redis is unavailable; set WEB_CONCURRENCY=1 to run with in-memory storage")
+    paradox_loop_server.start_background_threads()
@@ -0,0 +1,25 @@
+import hmac
+import hashlib
+from security.hmac_validation import SECRET_KEY, _keyed_states, generate_hmac_signature, verify_hmac_signature  # Note: Requires backend/src on PYTHONPATH
+
+def test_signature_matches_stdlib_hmac():
+    """Test that the precomputed key states produce the standard HMAC-SHA256."""
+    payload = b'{"token": "abc", "answer": "flying cars"}'
+    assert generate_hmac_signature(payload) == hmac.new(SECRET_KEY, payload, hashlib.sha256).hexdigest()
+
+def test_keyed_states_hash_long_keys():
+    """Test that keys longer than the block size are hashed first, as in RFC 2104."""
+    key = b'k' * 100
+    inner, outer = _keyed_states(key)
+    inner.update(b'payload')
+    outer.update(inner.digest())
+    assert outer.hexdigest() == hmac.new(key, b'payload', hashlib.sha256).hexdigest()
+
+def test_verify_hmac_signature():
+    """Test that only the exact hex signature of the payload verifies."""
+    signature = generate_hmac_signature(b'payload')
+    assert verify_hmac_signature(b'payload', signature)
+    assert verify_hmac_signature(b'payload', signature.upper())
+    assert not verify_hmac_signature(b'tampered', signature)
+    assert not verify_hmac_signature(b'payload', signature[:-2])
+    assert not verify_hmac_signature(b'payload', 'zz' * 32)
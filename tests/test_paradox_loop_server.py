@@ -3,7 +3,8 @@ import time
 import json
 from typing import Dict
 from flask import Response
-from paradox_loop_server import app, verify_hmac_signature, mk_token, store_session, get_session, new_session, create_round, pick_challenge, score_round, VALIDATORS
+import paradox_loop_server
+from paradox_loop_server import app, generate_hmac_signature, mk_token, store_session, get_session, new_session, create_round, record_result, challenge_creative_input, challenge_meta_loop, pick_challenge, score_round, paradox_decide_next, VALIDATORS, MAX_STORED_ROUNDS, MAX_ROUNDS
 
 @pytest.fixture
 def client():
@@ -18,8 +19,8 @@ def valid_session():
     return new_session()
 
 def generate_valid_signature(payload: Dict) -> str:
-    """Generate a valid HMAC signature for a payload."""
-    return verify_hmac_signature(payload, 'test')  # Note: Requires HMAC_SECRET set
+    """Generate a valid HMAC signature for the JSON body of a payload."""
+    return generate_hmac_signature(json.dumps(payload).encode())  # Note: Requires HMAC_SECRET set
 
 def test_hmac_signature_required(client: Response, valid_session: Dict):
     """Test that requests without signature are rejected."""
@@ -40,7 +41,7 @@ def test_oversized_answer(client: Response, valid_session: Dict):
     store_session(valid_session)
     payload = {'token': valid_session['token'], 'round_id': 'test', 'answer': 'A' * 1001}
     signature = generate_valid_signature(payload)
-    response = client.post('/respond', json=payload, headers={'X-Payload-Signature': signature})
+    response = client.post('/respond', data=json.dumps(payload), content_type='application/json', headers={'X-Payload-Signature': signature})
     assert response.status_code == 400
     assert json.loads(response.data)['error'] == 'bad_request'
 
@@ -49,7 +50,7 @@ def test_invalid_answer_type(client: Response, valid_session: Dict):
     store_session(valid_session)
     payload = {'token': valid_session['token'], 'round_id': 'test', 'answer': 123}
     signature = generate_valid_signature(payload)
-    response = client.post('/respond', json=payload, headers={'X-Payload-Signature': signature})
+    response = client.post('/respond', data=json.dumps(payload), content_type='application/json', headers={'X-Payload-Signature': signature})
     assert response.status_code == 400
     assert json.loads(response.data)['error'] == 'bad_request'
 
@@ -73,7 +74,7 @@ def test_session_expiry(client: Response, valid_session: Dict):
     store_session(valid_session)
     payload = {'token': valid_session['token'], 'round_id': 'test', 'answer': 'test'}
     signature = generate_valid_signature(payload)
-    response = client.post('/respond', json=payload, headers={'X-Payload-Signature': signature})
+    response = client.post('/respond', data=json.dumps(payload), content_type='application/json', headers={'X-Payload-Signature': signature})
     assert response.status_code == 404
     assert json.loads(response.data)['error'] == 'not_found'
 
@@ -81,7 +82,7 @@ def test_session_not_found(client: Response):
     """Test that non-existent sessions are rejected."""
     payload = {'token': 'nonexistent', 'round_id': 'test', 'answer': 'test'}
     signature = generate_valid_signature(payload)
-    response = client.post('/respond', json=payload, headers={'X-Payload-Signature': signature})
+    response = client.post('/respond', data=json.dumps(payload), content_type='application/json', headers={'X-Payload-Signature': signature})
     assert response.status_code == 404
     assert json.loads(response.data)['error'] == 'not_found'
 
@@ -93,7 +94,7 @@ def test_round_already_answered(client: Response, valid_session: Dict):
     store_session(valid_session)
     payload = {'token': valid_session['token'], 'round_id': round_obj['round_id'], 'answer': 'test'}
     signature = generate_valid_signature(payload)
-    response = client.post('/respond', json=payload, headers={'X-Payload-Signature': signature})
+    response = client.post('/respond', data=json.dumps(payload), content_type='application/json', headers={'X-Payload-Signature': signature})
     assert response.status_code == 400
     assert json.loads(response.data)['error'] == 'bad_request'
 
@@ -129,6 +130,65 @@ def test_meta_loop_validator(valid_session: Dict):
     assert explanation == 'human-like recall'
     assert bot_likelihood == 0.2
 
+def test_meta_loop_validator_positional_similarity(valid_session: Dict):
+    """Test meta loop validator counts positional character matches."""
+    challenge = {'type': 'meta_loop', 'validator_key': 'meta_loop', 'context': {'prev_answers': ['flying car']}}
+    score, explanation, _ = score_round(valid_session, challenge, 'flying dog', {})
+    assert score == 4
+    assert explanation == 'human-like recall'
+    score, explanation, _ = score_round(valid_session, challenge, 'xxxxxxxxxx', {})
+    assert score == 1
+    assert explanation == 'exact or no match'
+
+def test_round_index_tracks_trimmed_rounds(valid_session: Dict):
+    """Test that the round index stays aligned after old rounds are trimmed."""
+    for _ in range(MAX_STORED_ROUNDS + 2):
+        create_round(valid_session, pick_challenge(valid_session))
+    assert len(valid_session['rounds']) == MAX_STORED_ROUNDS
+    assert len(valid_session['round_index']) == MAX_STORED_ROUNDS
+    for idx, round_obj in enumerate(valid_session['rounds']):
+        assert valid_session['round_index'][round_obj['round_id']] == idx
+
+def test_memory_session_cap_is_global(monkeypatch):
+    """Test that the in-memory cap applies across shards, evicting the oldest sessions."""
+    base = paradox_loop_server.memory_session_count()
+    monkeypatch.setattr(paradox_loop_server, 'MAX_MEMORY_SESSIONS', base + 40)
+    sessions = [new_session() for _ in range(50)]
+    for session in sessions:
+        store_session(session)
+    assert paradox_loop_server.memory_session_count() == base + 40
+    assert get_session(sessions[-1]['token']) is not None
+
+def test_recursive_paradox_validator_with_pending_round(valid_session: Dict):
+    """Test recursive paradox validator while the current round is unanswered."""
+    challenge = {'type': 'recursive_paradox', 'validator_key': 'recursive_paradox', 'context': {'round_num': 1}}
+    create_round(valid_session, challenge)
+    score, explanation, _ = score_round(valid_session, challenge, 'False', {})
+    assert score == 4
+    assert explanation == 'recursive validation'
+
+def test_meta_loop_challenge_uses_recorded_answers(valid_session: Dict):
+    """Test meta loop challenges reference answers recorded on the session."""
+    round_obj = create_round(valid_session, pick_challenge(valid_session))
+    record_result(valid_session, round_obj, {'answered_at': time.time(), 'answer': 'flying car', 'human_score': 4})
+    challenge = challenge_meta_loop(valid_session)
+    assert challenge['type'] == 'meta_loop'
+    assert challenge['context']['prev_answers'] == ['flying car']
+
+def test_deep_trap_session_stays_in_loop(valid_session: Dict):
+    """Test that a bot in deep trap keeps getting trap rounds past MAX_ROUNDS while its depth grows."""
+    round_obj = create_round(valid_session, pick_challenge(valid_session))
+    actions, depths = [], []
+    for _ in range(2 * MAX_ROUNDS):
+        record_result(valid_session, round_obj, {'answered_at': time.time(), 'answer': 'x', 'human_score': 2, 'bot_likelihood': 0.6})
+        _, action, _, next_round_id = paradox_decide_next(valid_session, round_obj)
+        actions.append(action)
+        depths.append(valid_session['trap_depth'])
+        round_obj = valid_session['rounds'][valid_session['round_index'][next_round_id]]
+    assert actions[-MAX_ROUNDS:] == ['deep_trap'] * MAX_ROUNDS
+    assert depths == sorted(depths)
+    assert depths[-1] > depths[MAX_ROUNDS]
+
 def test_all_challenge_factories(valid_session: Dict):
     """Test that all challenge factories return valid challenges."""
     for factory in ALL_CHALLENGE_FACTORIES:
@@ -185,12 +245,12 @@ def test_session_endpoint_success(client: Response):
 
 def test_respond_endpoint_success(client: Response, valid_session: Dict):
     """Test successful response submission."""
-    challenge = pick_challenge(valid_session)
+    challenge = challenge_creative_input(valid_session)
     round_obj = create_round(valid_session, challenge)
     store_session(valid_session)
     payload = {'token': valid_session['token'], 'round_id': round_obj['round_id'], 'answer': 'Flying cars'}
     signature = generate_valid_signature(payload)
-    response = client.post('/respond', json=payload, headers={'X-Payload-Signature': signature})
+    response = client.post('/respond', data=json.dumps(payload), content_type='application/json', headers={'X-Payload-Signature': signature})
     assert response.status_code == 200
     data = json.loads(response.data)
     assert 'round_result' in data